@@ -5,17 +5,131 @@ Einfaches Tool zum Verwalten von Terminen und Generieren von ICS-Kalendern
 """
 
 import sqlite3
+import functools
 import hashlib
+import json
 import argparse
+import io
 import re
 import os
 import sys
-import requests
-from bs4 import BeautifulSoup
+import threading
 from datetime import datetime, timedelta
 from typing import List, Dict, Optional
 import urllib.parse
 
+# Aktuelle Schema-Version (PRAGMA user_version) - bei Schema-Änderungen erhöhen
+SCHEMA_VERSION = 5
+
+# Vorcompilierte Keyword-Matcher für die Detail-Extraktoren
+# (case-insensitive Suche ohne Lowercase-Kopie jeder einzelnen Zelle)
+_RE_MAPS = re.compile(r'google maps', re.I)
+_RE_ADDR = re.compile(r'adresse|bad-adresse', re.I)
+_RE_RESULT_KEY = re.compile(r'ergebnis|result|endstand', re.I)
+_RE_REFEREE_KEY = re.compile(r'schiedsrichter|referee|\bref\b|\bsr\b', re.I)
+
+# Vorcompiliertes Muster für Spielergebnisse ("12:8" bzw. "12-8")
+_RE_SCORE = re.compile(r'\b(\d{1,2}[:\-]\d{1,2})\b')
+
+# Vorcompilierte Muster für das Zeilen-Parsing (Datum/Zeit/GameID) und
+# die Teamnamen-Normalisierung - keine re-Cache-Lookups in den Hot Loops
+_RE_DATE = re.compile(r'(\d{1,2}\.\d{1,2}\.\d{2,4})')
+_RE_TIME = re.compile(r'(\d{1,2}:\d{2})')
+_RE_GAME_ID = re.compile(r'GameID=(\d+)')
+_RE_YEAR_SUFFIX = re.compile(r'\s+\d{4}')
+_RE_WHITESPACE = re.compile(r'\s+')
+_RE_LEADING_NUM = re.compile(r'^\d+[^\w]*')
+
+# Gültiges Spieldatum: DD.MM.YYYY komplett (fullmatch), Jahresprüfung folgt per int
+_RE_VALID_DATE = re.compile(r'(\d{1,2})\.(\d{1,2})\.(\d{4})')
+
+# Vereins-/Füllwörter, die keine Schiedsrichternamen sind - als eine
+# compilierte Alternation statt K Substring-Scans pro Zelle
+_RE_REF_BLACKLIST = re.compile('|'.join(map(re.escape, (
+    'essen', 'oberhausen', 'vs', 'mehr', 'spiel', 'solingen',
+    'wuppertal', 'bochum', 'duisburg', 'rheinhausen', 'kevelaer',
+    'tpsk', 'sgw', 'sv', 'asc', 'wsg', 'blau-weiß'
+))), re.I)
+
+# Bekannte Competition-Prefixe in Descriptions ("[LIGA]" ist der Fallback
+# für alte Einträge); str.startswith akzeptiert das Tupel direkt
+_COMPETITION_PREFIXES = ("[LIGA]", "[POKAL]", "[NRW POKAL]",
+                         "[VERBANDSLIGA]", "[RUHRGEBIETSLIGA]")
+
+# Dieselben Prefixe als ein compiliertes Muster für die Listenausgabe
+# (ein match statt einer startswith-Kaskade pro Zeile)
+_RE_COMP_TAG = re.compile(r'^(\[(?:VERBANDSLIGA|RUHRGEBIETSLIGA|NRW POKAL|POKAL|LIGA)\])')
+
+# RFC-5545-Escaping für ICS-Textfelder in einem einzigen translate-Lauf
+# (statt verketteter str.replace-Kopien; escapt auch ';' und ',' korrekt)
+_ICS_ESCAPE = str.maketrans({'\\': '\\\\', ';': '\\;', ',': '\\,', '\n': '\\n', '\r': ''})
+
+# Zuordnung Description-Zeile -> Feldname für den Änderungsvergleich
+_DESC_LINE_PREFIXES = {'Result:': 'result', 'Ref 1:': 'ref1', 'Ref 2:': 'ref2'}
+
+# SQL der gebatchten Schreibpfade als Modulkonstanten: sqlite3 cached
+# prepared Statements nur bei exakt gleichem Statement-Text, so bleibt
+# der Cache über alle save_termine-Aufrufe hinweg warm
+_UPDATE_GAME_SQL = '''
+    UPDATE games
+    SET home = ?, guest = ?, date = ?, time = ?, location = ?, description = ?,
+        start_ts = ?, sequence = sequence + 1, last_change = CURRENT_TIMESTAMP
+    WHERE event_id = ?
+'''
+_INSERT_GAME_SQL = '''
+    INSERT INTO games
+    (event_id, home, guest, date, time, location, description, start_ts)
+    VALUES (?, ?, ?, ?, ?, ?, ?, ?)
+'''
+
+def _parse_description_fields(desc: str) -> Dict:
+    """Zerlegt eine Description in ihre Result-/Schiedsrichter-Felder"""
+    fields = {}
+    if desc:
+        for line in desc.split('\n'):
+            for prefix, key in _DESC_LINE_PREFIXES.items():
+                if line.startswith(prefix):
+                    fields[key] = line[len(prefix):].strip()
+                    break
+    return fields
+
+@functools.lru_cache(maxsize=512)
+def _parse_game_datetime(date: str, time: str) -> Optional[datetime]:
+    """Parst Datum (DD.MM.YYYY oder YYYY-MM-DD) plus optionale Uhrzeit.
+
+    Memoisiert, da dieselben Datum/Zeit-Paare beim Sortieren und Filtern
+    mehrfach auftauchen.
+    """
+    # Manuelles Zerlegen statt strptime - die Formate sind fix und
+    # strptime baut intern jedes Mal einen Regex-Match auf
+    try:
+        if '.' in date:
+            day, month, year = date.split('.')
+        else:
+            year, month, day = date.split('-')
+        dt = datetime(int(year), int(month), int(day))
+    except ValueError:
+        return None
+
+    if time and ':' in time:
+        try:
+            time_parts = time.split(':')
+            dt = dt.replace(hour=int(time_parts[0]), minute=int(time_parts[1]))
+        except ValueError:
+            pass
+
+    return dt
+
+def _ics_ts(dt: datetime) -> str:
+    """Formatiert einen ICS-Zeitstempel (YYYYMMDDTHHMMSS) ohne strftime-Overhead"""
+    return (f"{dt.year:04d}{dt.month:02d}{dt.day:02d}"
+            f"T{dt.hour:02d}{dt.minute:02d}{dt.second:02d}")
+
+def _format_start_ts(date: str, time: str) -> Optional[str]:
+    """Berechnet den sortierbaren ISO-Zeitstempel (YYYY-MM-DDTHH:MM) eines Termins"""
+    dt = _parse_game_datetime(date or '', time or '')
+    return dt.strftime('%Y-%m-%dT%H:%M') if dt is not None else None
+
 class SGWTermineScraper:
     def __init__(self, db_path: str = "sgw_termine.db"):
         self.db_path = db_path
@@ -61,33 +175,98 @@ class SGWTermineScraper:
                 }
             }
         }
-        self.session = requests.Session()
-        self.session.headers.update({
-            'Host': 'dsvdaten.dsv.de',
-            'Sec-Ch-Ua': '"Not?A_Brand";v="99", "Chromium";v="130"',
-            'Sec-Ch-Ua-Mobile': '?0',
-            'Sec-Ch-Ua-Platform': '"Windows"',
-            'Accept-Language': 'de-DE,de;q=0.9',
-            'Upgrade-Insecure-Requests': '1',
-            'User-Agent': 'Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/130.0.6723.70 Safari/537.36',
-            'Accept': 'text/html,application/xhtml+xml,application/xml;q=0.9,image/avif,image/webp,image/apng,*/*;q=0.8,application/signed-exchange;v=b3;q=0.7',
-            'Sec-Fetch-Site': 'same-origin',
-            'Sec-Fetch-Mode': 'navigate',
-            'Sec-Fetch-User': '?1',
-            'Sec-Fetch-Dest': 'document',
-            'Referer': 'https://dsvdaten.dsv.de/Modules/WB/Index.aspx',
-            'Accept-Encoding': 'gzip, deflate, br',
-            'Priority': 'u=0, i'
-        })
+        # HTTP-Session erst beim ersten Netzwerkzugriff aufbauen, damit
+        # --list/--add-Aufrufe requests gar nicht erst importieren;
+        # der Lock schützt den Erstaufbau vor den parallelen Scrape-Threads
+        self._session = None
+        self._session_lock = threading.Lock()
         # URL für einzelne Spiele
         self.game_detail_url = "https://dsvdaten.dsv.de/Modules/WB/Game.aspx"
+        # Eine Verbindung pro Prozess statt connect/close in jeder Methode;
+        # der Lock serialisiert Zugriffe aus den parallelen Scrape-Threads
+        self._conn = None
+        self._db_lock = threading.Lock()
         self.init_database()
-    
+
+    @property
+    def session(self):
+        """Gibt die gecachte HTTP-Session zurück (einmalig aufgebaut)"""
+        if self._session is not None:
+            return self._session
+
+        with self._session_lock:
+            # Erneut prüfen: ein anderer Thread kann die Session inzwischen
+            # gebaut haben. Komplett lokal aufbauen und erst fertig
+            # konfiguriert zuweisen, damit kein Thread eine Session ohne
+            # Adapter/Header zu sehen bekommt.
+            if self._session is not None:
+                return self._session
+
+            # Lazy Import, siehe _scrape_competition
+            import requests
+
+            session = requests.Session()
+            # Grosser Keep-Alive-Pool: die parallelen Detail-Fetches teilen sich
+            # die Session, ohne Verbindungen zu verwerfen und neu auszuhandeln
+            adapter = requests.adapters.HTTPAdapter(pool_connections=20, pool_maxsize=20)
+            session.mount('https://', adapter)
+            session.mount('http://', adapter)
+            session.headers.update({
+                'Host': 'dsvdaten.dsv.de',
+                'Sec-Ch-Ua': '"Not?A_Brand";v="99", "Chromium";v="130"',
+                'Sec-Ch-Ua-Mobile': '?0',
+                'Sec-Ch-Ua-Platform': '"Windows"',
+                'Accept-Language': 'de-DE,de;q=0.9',
+                'Upgrade-Insecure-Requests': '1',
+                'User-Agent': 'Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/130.0.6723.70 Safari/537.36',
+                'Accept': 'text/html,application/xhtml+xml,application/xml;q=0.9,image/avif,image/webp,image/apng,*/*;q=0.8,application/signed-exchange;v=b3;q=0.7',
+                'Sec-Fetch-Site': 'same-origin',
+                'Sec-Fetch-Mode': 'navigate',
+                'Sec-Fetch-User': '?1',
+                'Sec-Fetch-Dest': 'document',
+                'Referer': 'https://dsvdaten.dsv.de/Modules/WB/Index.aspx',
+                'Accept-Encoding': 'gzip, deflate, br',
+                'Priority': 'u=0, i'
+            })
+            self._session = session
+        return self._session
+
+    def _get_conn(self) -> sqlite3.Connection:
+        """Gibt die gecachte SQLite-Verbindung zurück (einmalig geöffnet)"""
+        if self._conn is None:
+            # check_same_thread=False: die Scrape-Threads lesen/schreiben den
+            # HTTP-Cache über dieselbe Verbindung (serialisiert per _db_lock)
+            self._conn = sqlite3.connect(self.db_path, check_same_thread=False)
+            # WAL vermeidet das fsync pro Commit, der Rest reduziert Temp-I/O;
+            # mmap und cache_size halten die (kleine) DB komplett im Speicher
+            self._conn.executescript(
+                'PRAGMA journal_mode=WAL;'
+                'PRAGMA synchronous=NORMAL;'
+                'PRAGMA temp_store=MEMORY;'
+                'PRAGMA mmap_size=268435456;'
+                'PRAGMA cache_size=-65536;'
+            )
+        return self._conn
+
+    def close(self):
+        """Schließt die gecachte Datenbankverbindung und die HTTP-Session"""
+        if self._conn is not None:
+            self._conn.close()
+            self._conn = None
+        if self._session is not None:
+            self._session.close()
+            self._session = None
+
     def init_database(self):
         """Initialisiert die SQLite-Datenbank"""
-        conn = sqlite3.connect(self.db_path)
+        conn = self._get_conn()
         cursor = conn.cursor()
-        
+
+        # Schema bereits aktuell? Dann keine ALTER-Probes bei jedem Start
+        cursor.execute('PRAGMA user_version')
+        if cursor.fetchone()[0] == SCHEMA_VERSION:
+            return
+
         cursor.execute('''
             CREATE TABLE IF NOT EXISTS games (
                 id INTEGER PRIMARY KEY AUTOINCREMENT,
@@ -98,32 +277,32 @@ class SGWTermineScraper:
                 time TEXT,
                 location TEXT,
                 description TEXT,
+                start_ts TEXT,
+                sequence INTEGER NOT NULL DEFAULT 0,
                 last_change TIMESTAMP DEFAULT CURRENT_TIMESTAMP
             )
         ''')
-        
-        cursor.execute('CREATE INDEX IF NOT EXISTS idx_event_id ON games(event_id)')
+
+        # event_id ist UNIQUE und hat damit bereits einen impliziten Index;
+        # der früher zusätzlich angelegte idx_event_id war reine Schreiblast
+        cursor.execute('DROP INDEX IF EXISTS idx_event_id')
         cursor.execute('CREATE INDEX IF NOT EXISTS idx_date ON games(date)')
-        
+
+        # Vorhandene Spalten einmal abfragen statt ALTER-Versuche per Exception
+        cursor.execute("PRAGMA table_info(games)")
+        columns = {row[1] for row in cursor.fetchall()}
+
         # Füge location-Spalte hinzu falls sie nicht existiert (Migration)
-        try:
+        if 'location' not in columns:
             cursor.execute('ALTER TABLE games ADD COLUMN location TEXT')
-        except sqlite3.OperationalError:
-            # Spalte existiert bereits
-            pass
-        
+
         # Füge description-Spalte hinzu und migriere result-Daten (Migration)
-        try:
+        if 'description' not in columns:
             cursor.execute('ALTER TABLE games ADD COLUMN description TEXT')
-        except sqlite3.OperationalError:
-            # Spalte existiert bereits
-            pass
-        
-        
+
         # Migriere result zu description falls result-Spalte existiert
         try:
-            cursor.execute("SELECT name FROM pragma_table_info('games') WHERE name='result'")
-            if cursor.fetchone():
+            if 'result' in columns:
                 # Migriere alle Daten von result zu description
                 cursor.execute('UPDATE games SET description = result WHERE result IS NOT NULL AND result != ""')
                 
@@ -154,24 +333,91 @@ class SGWTermineScraper:
                 cursor.execute('ALTER TABLE games_new RENAME TO games')
                 
                 # Erstelle Indizes neu
-                cursor.execute('CREATE INDEX IF NOT EXISTS idx_event_id ON games(event_id)')
                 cursor.execute('CREATE INDEX IF NOT EXISTS idx_date ON games(date)')
         except sqlite3.OperationalError as e:
             pass
-        
+
+        # start_ts: vorberechneter ISO-Zeitstempel, damit Filter und Sortierung
+        # in SQL laufen können statt jedes Datum in Python zu parsen
+        # (Probe nach der result-Migration, da diese die Tabelle neu aufbaut)
+        cursor.execute("SELECT COUNT(*) FROM pragma_table_info('games') WHERE name='start_ts'")
+        if not cursor.fetchone()[0]:
+            cursor.execute('ALTER TABLE games ADD COLUMN start_ts TEXT')
+
+        # Backfill für bestehende Zeilen
+        cursor.execute('SELECT id, date, time FROM games WHERE start_ts IS NULL')
+        backfill = []
+        for row_id, date, time in cursor.fetchall():
+            start_ts = _format_start_ts(date, time)
+            if start_ts is not None:
+                backfill.append((start_ts, row_id))
+        if backfill:
+            cursor.executemany('UPDATE games SET start_ts = ? WHERE id = ?', backfill)
+
+        cursor.execute('CREATE INDEX IF NOT EXISTS idx_start_ts ON games(start_ts)')
+
+        # sequence: Revisionszähler pro Event für SEQUENCE im ICS - Kalender-
+        # Clients aktualisieren ein Event nur bei erhöhter SEQUENCE
+        cursor.execute("SELECT COUNT(*) FROM pragma_table_info('games') WHERE name='sequence'")
+        if not cursor.fetchone()[0]:
+            cursor.execute('ALTER TABLE games ADD COLUMN sequence INTEGER NOT NULL DEFAULT 0')
+
+        # HTTP-Cache für Conditional Requests (ETag/Last-Modified) gegen
+        # die DSV-Listenseiten; Body wird für 304-Antworten wiederverwendet
+        cursor.execute('''
+            CREATE TABLE IF NOT EXISTS http_cache (
+                url TEXT PRIMARY KEY,
+                etag TEXT,
+                last_modified TEXT,
+                body BLOB
+            )
+        ''')
+
+        # Schema-Version setzen, damit künftige Starts direkt zurückkehren
+        cursor.execute(f'PRAGMA user_version = {SCHEMA_VERSION}')
+
         conn.commit()
-        conn.close()
     
+    def _http_cache_get(self, url: str):
+        """Liest ETag/Last-Modified/Body für eine URL (thread-sicher)"""
+        with self._db_lock:
+            cursor = self._get_conn().cursor()
+            cursor.execute(
+                'SELECT etag, last_modified, body FROM http_cache WHERE url = ?',
+                (url,))
+            return cursor.fetchone()
+
+    def _http_cache_put(self, url: str, etag: str, last_modified: str, body: bytes):
+        """Speichert Validator-Header und Body für eine URL (thread-sicher)"""
+        with self._db_lock:
+            conn = self._get_conn()
+            conn.execute('''
+                INSERT OR REPLACE INTO http_cache (url, etag, last_modified, body)
+                VALUES (?, ?, ?, ?)
+            ''', (url, etag, last_modified, body))
+            conn.commit()
+
     def generate_event_id(self, home: str, guest: str, competition: str = "") -> str:
         """Generiert eindeutige Event-ID basierend auf Teams und Wettbewerb (normalisiert)"""
         # Normalisiere Teamnamen für konsistente Event-IDs
         home_norm = self._normalize_team_name(home)
         guest_norm = self._normalize_team_name(guest)
-        content = f"{competition}_{home_norm}_vs_{guest_norm}".strip()
-        return hashlib.md5(content.encode('utf-8')).hexdigest()
+        # Fragmente direkt in den Hash füttern statt erst einen
+        # Zwischenstring zu bauen und zu encodieren; die Teile sind durch
+        # die Normalisierung bereits getrimmt, die Bytes bleiben identisch
+        h = hashlib.md5()
+        h.update(competition.encode('utf-8'))
+        h.update(b'_')
+        h.update(home_norm.encode('utf-8'))
+        h.update(b'_vs_')
+        h.update(guest_norm.encode('utf-8'))
+        return h.hexdigest()
     
-    def _normalize_team_name(self, team_name: str) -> str:
-        """Normalisiert Teamnamen für konsistente Event-IDs"""
+    @staticmethod
+    @functools.lru_cache(maxsize=256)
+    def _normalize_team_name(team_name: str) -> str:
+        """Normalisiert Teamnamen für konsistente Event-IDs (memoisiert,
+        da sich Teamnamen über eine Saison ständig wiederholen)"""
         if not team_name:
             return ""
         
@@ -190,8 +436,8 @@ class SGWTermineScraper:
         
         # Normalisiere andere Teams (entferne Jahreszahlen und Zusätze)
         # SV Rheinhausen 1913 II -> SV Rheinhausen II
-        normalized = re.sub(r'\s+\d{4}', '', normalized)  # Entferne Jahreszahlen
-        normalized = re.sub(r'\s+', ' ', normalized).strip()  # Normalisiere Leerzeichen
+        normalized = _RE_YEAR_SUFFIX.sub('', normalized)  # Entferne Jahreszahlen
+        normalized = _RE_WHITESPACE.sub(' ', normalized).strip()  # Normalisiere Leerzeichen
         
         return normalized
     
@@ -201,23 +447,12 @@ class SGWTermineScraper:
             return False
         
         date = game.get('date', '').strip()
-        
-        # Spiel muss ein gültiges Datum haben
-        if not date or date.lower() in ['unbekannt', 'unknown', '', '-']:
-            return False
-        
-        # Prüfe ob Datum ein gültiges Format hat
-        try:
-            if '.' in date:
-                # Format: DD.MM.YYYY
-                parts = date.split('.')
-                if len(parts) == 3:
-                    day, month, year = parts
-                    if int(day) > 0 and int(month) > 0 and int(year) > 2020:
-                        return True
-            return False
-        except (ValueError, IndexError):
-            return False
+
+        # Ein fullmatch ersetzt lower()/split()/try-int pro Zeile; Platzhalter
+        # wie "unbekannt" oder "-" fallen dabei automatisch durch
+        m = _RE_VALID_DATE.fullmatch(date)
+        return (m is not None and
+                int(m.group(1)) > 0 and int(m.group(2)) > 0 and int(m.group(3)) > 2020)
     
     def scrape_termine(self, enable_scraping=False) -> List[Dict]:
         """Scraping von DSV-Website für alle Wettbewerbe"""
@@ -225,84 +460,133 @@ class SGWTermineScraper:
             print("Scraping disabled - use --enable-scraping to activate")
             return []
         
-        all_termine = []
-        
+        # Lazy Import, siehe _scrape_competition
+        from concurrent.futures import ThreadPoolExecutor
+
         print("Scraping DSV website...")
-        # Scrape alle konfigurierten Wettbewerbe
-        for comp_key, comp_info in self.competitions.items():
-            comp_termine = self._scrape_competition(comp_info['params'], comp_key)
-            all_termine.extend(comp_termine)
-        
+        # Alle konfigurierten Wettbewerbe parallel abholen - I/O-bound,
+        # die gepoolte Session hält die Verbindungen offen; map() liefert
+        # die Ergebnisse in Konfigurationsreihenfolge zurück
+        all_termine = []
+        with ThreadPoolExecutor(max_workers=len(self.competitions)) as executor:
+            results = executor.map(
+                lambda item: self._scrape_competition(item[1]['params'], item[0]),
+                self.competitions.items())
+            for comp_termine in results:
+                all_termine.extend(comp_termine)
+
         return all_termine
     
     def _scrape_competition(self, params: Dict, competition_type: str) -> List[Dict]:
         """Scraping einer spezifischen Competition (Pokal oder Liga)"""
+        # Lazy Import: lxml wird nur beim Scrapen gebraucht, nicht für
+        # --list/--add-Aufrufe (spart Startzeit z.B. unter cron)
+        from lxml import etree
+
         try:
-            response = self.session.get(self.base_url, params=params)
-            response.raise_for_status()
-            soup = BeautifulSoup(response.content, 'html.parser')
-            
-            # Finde alle Tabellenzeilen
-            rows = soup.find_all('tr')
-            
+            # Conditional Request: bekannte Validator-Header mitschicken und
+            # bei 304 den gecachten Body wiederverwenden (spart Download und
+            # Parse, falls der Server ETag/Last-Modified liefert)
+            cache_url = f"{self.base_url}?{urllib.parse.urlencode(params)}"
+            cached = self._http_cache_get(cache_url)
+            request_headers = {}
+            if cached:
+                if cached[0]:
+                    request_headers['If-None-Match'] = cached[0]
+                if cached[1]:
+                    request_headers['If-Modified-Since'] = cached[1]
+
+            response = self.session.get(self.base_url, params=params,
+                                        headers=request_headers)
+            if response.status_code == 304 and cached:
+                content = cached[2]
+            else:
+                response.raise_for_status()
+                content = response.content
+                etag = response.headers.get('ETag', '')
+                last_modified = response.headers.get('Last-Modified', '')
+                if etag or last_modified:
+                    self._http_cache_put(cache_url, etag, last_modified, content)
+
+            # Stream-Parsing: nur <tr>-Elemente materialisieren statt des ganzen DOM
+            context = etree.iterparse(io.BytesIO(content),
+                                      events=('end',), tag='tr', html=True)
+
             termine = []
             current_round = ""
-            
-            for row in rows:
-                cells = row.find_all(['td', 'th'])
+
+            for _, row in context:
+                cells = list(row.iter('td', 'th'))
                 if len(cells) < 6:
+                    row.clear()
                     continue
-                
+
+                # Zelltexte einmal pro Zeile extrahieren; Filter und Parser
+                # arbeiten auf derselben Liste statt get_text pro Zugriff
+                cell_texts = [self._cell_text(cell) for cell in cells]
+
                 # Prüfe auf Runden-Header
-                if len(cells) == 1 and 'Runde' in cells[0].get_text():
-                    current_round = cells[0].get_text(strip=True)
+                if len(cells) == 1 and 'Runde' in cell_texts[0]:
+                    current_round = cell_texts[0]
+                    row.clear()
                     continue
-                
+
                 # Extrahiere Spiel-Daten
-                row_text = ' '.join([cell.get_text(strip=True) for cell in cells])
-                
+                row_text = ' '.join(cell_texts)
+
                 # Suche nach SGW Essen Spielen
                 if 'SG Wasserball Essen' in row_text or 'Essen' in row_text:
                     # Filtere Tabellen-/Statistik-Zeilen aus
-                    if ('Gesamttabelle' in row_text or 
+                    if ('Gesamttabelle' in row_text or
                         'kein dir. Vergleich' in row_text or
                         'Pkt:' in row_text or
                         'TD:' in row_text or
                         'Tore:' in row_text):
+                        row.clear()
                         continue
-                    
-                    game = self._parse_simple_game_row(cells, current_round, competition_type)
+
+                    game = self._parse_simple_game_row(cells, cell_texts,
+                                                       current_round, competition_type)
                     if game and self._is_valid_game(game):
                         termine.append(game)
-            
+
+                # Zeile freigeben, damit der Speicher nicht mit dem DOM wächst
+                row.clear()
+
             return termine
-            
+
         except Exception as e:
             print(f"Error scraping {competition_type}: {e}")
             return []
     
-    def _parse_simple_game_row(self, cells, current_round: str, competition_type: str = "cup") -> Dict:
-        """Einfaches Parsing einer Spielzeile"""
+    @staticmethod
+    def _cell_text(cell) -> str:
+        """Extrahiert den bereinigten Text einer lxml-Tabellenzelle"""
+        return ''.join(t.strip() for t in cell.itertext())
+
+    def _parse_simple_game_row(self, cells, cell_texts: List[str],
+                               current_round: str, competition_type: str = "cup") -> Dict:
+        """Einfaches Parsing einer Spielzeile (Zelltexte vorab extrahiert)"""
         try:
             # Extrahiere Daten aus den Zellen
-            game_id = cells[0].get_text(strip=True)
-            date_time = cells[1].get_text(strip=True)
-            home_team = cells[3].get_text(strip=True)
-            guest_team = cells[5].get_text(strip=True)
-            location = cells[6].get_text(strip=True)
-            result = cells[7].get_text(strip=True)
+            date_time = cell_texts[1]
+            home_team = cell_texts[3]
+            guest_team = cell_texts[5]
+            location = cell_texts[6]
+            result = cell_texts[7]
             
             # Parse Datum und Zeit
-            date_match = re.search(r'(\d{1,2}\.\d{1,2}\.\d{2,4})', date_time)
-            time_match = re.search(r'(\d{1,2}:\d{2})', date_time)
+            date_match = _RE_DATE.search(date_time)
+            time_match = _RE_TIME.search(date_time)
             
             date = ""
             time = ""
             if date_match:
                 date = date_match.group(1)
                 # Konvertiere 2-stelliges Jahr
-                if len(date.split('.')[-1]) == 2:
-                    year = int(date.split('.')[-1])
+                year_part = date.rsplit('.', 1)[-1]
+                if len(year_part) == 2:
+                    year = int(year_part)
                     year += 2000 if year < 50 else 1900
                     date = date[:-2] + str(year)
             
@@ -310,25 +594,27 @@ class SGWTermineScraper:
                 time = time_match.group(1)
             
             # Bestimme Home/Guest basierend auf Location
+            # (Membership-Test einmal statt viermal pro Zeile)
+            sgw_in_home = 'SG Wasserball Essen' in home_team
             if location and 'essen' in location.lower():
                 # SG Wasserball Essen ist zu Hause
-                final_home = home_team if 'SG Wasserball Essen' in home_team else guest_team
-                final_guest = guest_team if 'SG Wasserball Essen' in home_team else home_team
+                final_home = home_team if sgw_in_home else guest_team
+                final_guest = guest_team if sgw_in_home else home_team
             else:
                 # SG Wasserball Essen ist Gast
-                final_home = guest_team if 'SG Wasserball Essen' in home_team else home_team
-                final_guest = home_team if 'SG Wasserball Essen' in home_team else guest_team
+                final_home = guest_team if sgw_in_home else home_team
+                final_guest = home_team if sgw_in_home else guest_team
             
             # Extrahiere Game-ID für detaillierte Informationen
             game_id = None
             # Suche nach Links in allen Zellen
             for cell in cells:
-                links = cell.find_all('a')
+                links = cell.findall('.//a')
                 for link in links:
                     if link.get('href'):
                         href = link.get('href')
                         # Extrahiere GameID aus dem Link
-                        game_id_match = re.search(r'GameID=(\d+)', href)
+                        game_id_match = _RE_GAME_ID.search(href)
                         if game_id_match:
                             game_id = game_id_match.group(1)
                             break
@@ -377,15 +663,16 @@ class SGWTermineScraper:
             
             if date_cell:
                 # Suche nach Datum im Format DD.MM.YY, HH:MM Uhr
-                date_match = re.search(r'(\d{1,2}\.\d{1,2}\.\d{2,4})', date_cell)
-                time_match = re.search(r'(\d{1,2}:\d{2})', date_cell)
+                date_match = _RE_DATE.search(date_cell)
+                time_match = _RE_TIME.search(date_cell)
                 
                 date = date_match.group(1) if date_match else ""
                 time = time_match.group(1) if time_match else ""
                 
                 # Konvertiere 2-stelliges Jahr zu 4-stellig
-                if date and len(date.split('.')[-1]) == 2:
-                    year = int(date.split('.')[-1])
+                year_part = date.rsplit('.', 1)[-1] if date else ""
+                if len(year_part) == 2:
+                    year = int(year_part)
                     if year < 50:
                         year += 2000
                     else:
@@ -434,21 +721,24 @@ class SGWTermineScraper:
     def _clean_team_name(self, team_name: str) -> str:
         """Bereinigt Team-Namen"""
         # Entferne Zahlen und Sonderzeichen am Anfang
-        cleaned = re.sub(r'^\d+[^\w]*', '', team_name)
+        cleaned = _RE_LEADING_NUM.sub('', team_name)
         cleaned = cleaned.strip()
         
         if not cleaned or cleaned.isdigit():
             return ""
             
         # Entferne mehrfache Leerzeichen
-        cleaned = re.sub(r'\s+', ' ', cleaned)
+        cleaned = _RE_WHITESPACE.sub(' ', cleaned)
         return cleaned
     
     def fetch_game_details(self, game_id: str, competition_type: str = "cup") -> Optional[Dict]:
         """Holt detaillierte Spielinformationen von der Einzelspiel-Seite"""
+        # Lazy Import, siehe _scrape_competition
+        from bs4 import BeautifulSoup, SoupStrainer
+
         if not game_id:
             return None
-            
+
         try:
             # Parameter für die Game-Detail-URL (verwende entsprechende Competition-Parameter)
             if competition_type in self.competitions:
@@ -467,115 +757,66 @@ class SGWTermineScraper:
             
             response = self.session.get(self.game_detail_url, params=game_params)
             response.raise_for_status()
-            
-            soup = BeautifulSoup(response.content, 'html.parser')
-            
-            # Extrahiere detaillierte Informationen
-            details = {
-                'location_address': '',
-                'location_maps_link': '',
-                'detailed_result': '',
-                'referee1': '',
-                'referee2': '',
-                'is_played': False
-            }
-            
-            # Suche nach Adressinformationen
-            address_info = self._extract_location_info(soup)
-            if address_info:
-                details.update(address_info)
-            
-            # Suche nach detailliertem Ergebnis
-            result_info = self._extract_detailed_result(soup)
-            if result_info:
-                details['detailed_result'] = result_info
-                details['is_played'] = True
-            
-            # Suche nach Schiedsrichter-Informationen
-            referee_info = self._extract_referee_info(soup)
-            if referee_info:
-                details.update(referee_info)
-            
-            return details
-            
+
+            # lxml-Backend plus SoupStrainer: nur die Tabellen werden überhaupt
+            # in den Baum aufgenommen, Navigation/Footer etc. fliegen beim Parsen raus
+            soup = BeautifulSoup(response.content, 'lxml',
+                                 parse_only=SoupStrainer('table'))
+            
+            # Ein einziger Durchlauf über alle Tabellen für Ort, Ergebnis
+            # und Schiedsrichter statt drei getrennter DOM-Traversierungen
+            return self._extract_all_details(soup.find_all('table'))
+
         except Exception as e:
             return None
-    
-    def _extract_location_info(self, soup: BeautifulSoup) -> Optional[Dict]:
-        """Extrahiert Adress- und Google Maps-Informationen aus der Spieldetail-Seite"""
-        location_info = {
-            'location_address': '',
-            'location_maps_link': ''
-        }
-        
+
+    def _extract_all_details(self, tables: List) -> Dict:
+        """Extrahiert Ort, Ergebnis und Schiedsrichter in einem Tabellen-Durchlauf"""
+        maps_link = ''
+        url_address = ''
+        fallback_address = ''
+        detailed_result = ''
+        ref_names = []
+
         try:
-            # Suche nach "Google Maps:" in Tabellen
-            tables = soup.find_all('table')
             for table in tables:
-                rows = table.find_all('tr')
-                for row in rows:
+                for row in table.find_all('tr'):
                     cells = row.find_all(['td', 'th'])
-                    for i, cell in enumerate(cells):
-                        cell_text = cell.get_text(strip=True).lower()
-                        if 'google maps' in cell_text and i + 1 < len(cells):
+                    # Zelltexte einmal pro Zeile materialisieren statt pro Vergleich
+                    texts = [cell.get_text(strip=True) for cell in cells]
+
+                    # Keyword-Zustand gilt jeweils bis zum Zeilenende
+                    after_result_key = False
+                    after_ref_key = False
+
+                    for i, text in enumerate(texts):
+                        # Google-Maps-Link: Keyword-Zelle gefolgt von Link-Zelle
+                        if not maps_link and i + 1 < len(cells) and _RE_MAPS.search(text):
                             link = cells[i + 1].find('a', href=True)
                             if link:
-                                location_info['location_maps_link'] = link.get('href', '')
+                                maps_link = link.get('href', '')
                                 # Versuche Adresse aus URL zu extrahieren
                                 try:
-                                    parsed_url = urllib.parse.urlparse(location_info['location_maps_link'])
+                                    parsed_url = urllib.parse.urlparse(maps_link)
                                     query_params = urllib.parse.parse_qs(parsed_url.query)
                                     if 'q' in query_params:
-                                        location_info['location_address'] = query_params['q'][0]
+                                        url_address = query_params['q'][0]
                                     elif 'query' in query_params:
-                                        location_info['location_address'] = query_params['query'][0]
+                                        url_address = query_params['query'][0]
                                 except:
                                     pass
-                                break
-                    if location_info['location_maps_link']:
-                        break
-                if location_info['location_maps_link']:
-                    break
-            
-            # Suche nach Adresse in Tabellen falls nicht aus URL extrahiert
-            if not location_info['location_address']:
-                for table in tables:
-                    rows = table.find_all('tr')
-                    for row in rows:
-                        cells = row.find_all(['td', 'th'])
-                        for i, cell in enumerate(cells):
-                            cell_text = cell.get_text(strip=True).lower()
-                            if any(keyword in cell_text for keyword in ['adresse', 'bad-adresse']):
-                                if i + 1 < len(cells):
-                                    address = cells[i + 1].get_text(strip=True)
-                                    if address and len(address) > 3:
-                                        location_info['location_address'] = address
-                                        break
-                        if location_info['location_address']:
-                            break
-                    if location_info['location_address']:
-                        break
-            
-            return location_info if location_info['location_address'] or location_info['location_maps_link'] else None
-            
-        except Exception as e:
-            return None
-    
-    def _extract_detailed_result(self, soup: BeautifulSoup) -> Optional[str]:
-        """Extrahiert detailliertes Spielergebnis aus der Spieldetail-Seite"""
-        try:
-            # Suche nach Ergebnis in Tabellen
-            tables = soup.find_all('table')
-            for table in tables:
-                rows = table.find_all('tr')
-                for row in rows:
-                    cells = row.find_all(['td', 'th'])
-                    for i, cell in enumerate(cells):
-                        cell_text = cell.get_text(strip=True).lower()
-                        if any(keyword in cell_text for keyword in ['ergebnis', 'result', 'endstand']):
-                            for j in range(i + 1, len(cells)):
-                                result_text = cells[j].get_text(strip=True)
-                                match = re.search(r'\b(\d{1,2}[:\-]\d{1,2})\b', result_text)
+
+                        # Adresse: Keyword-Zelle gefolgt von Text-Zelle (Fallback
+                        # falls die Maps-URL keine Adresse hergibt)
+                        if (not fallback_address and i + 1 < len(texts) and
+                                _RE_ADDR.search(text) and
+                                texts[i + 1] and len(texts[i + 1]) > 3):
+                            fallback_address = texts[i + 1]
+
+                        # Ergebnis: Wert folgt irgendwo nach der Keyword-Zelle
+                        if not detailed_result:
+                            if after_result_key:
+                                match = _RE_SCORE.search(text)
                                 if match:
                                     result = match.group(1)
                                     parts = result.replace('-', ':').split(':')
@@ -583,294 +824,332 @@ class SGWTermineScraper:
                                         first, second = int(parts[0]), int(parts[1])
                                         # Filtere Zeit-Patterns aus
                                         if first > 23 or second > 59 or (first <= 30 and second <= 30):
-                                            return result.replace('-', ':')
-            return None
-            
-        except Exception as e:
-            return None
-    
-    def _extract_referee_info(self, soup: BeautifulSoup) -> Optional[Dict]:
-        """Extrahiert Schiedsrichter-Informationen aus der Spieldetail-Seite"""
-        referee_info = {
-            'referee1': '',
-            'referee2': ''
+                                            detailed_result = result.replace('-', ':')
+                            else:
+                                after_result_key = bool(_RE_RESULT_KEY.search(text))
+
+                        # Schiedsrichter: Namen folgen auf die Keyword-Zelle
+                        if len(ref_names) < 2:
+                            if after_ref_key:
+                                if (text and len(text) > 2 and not text.isdigit() and
+                                    ',' in text and  # Schiedsrichter haben meist Format "Nachname, Vorname"
+                                    not _RE_REF_BLACKLIST.search(text) and
+                                        text not in ref_names):
+                                    ref_names.append(text)
+                            else:
+                                after_ref_key = bool(_RE_REFEREE_KEY.search(text))
+        except Exception:
+            pass
+
+        return {
+            'location_address': url_address or fallback_address,
+            'location_maps_link': maps_link,
+            'detailed_result': detailed_result,
+            'referee1': ref_names[0] if ref_names else '',
+            'referee2': ref_names[1] if len(ref_names) > 1 else '',
+            'is_played': bool(detailed_result)
         }
-        
-        try:
-            all_ref_names = []
-            
-            # Suche in Tabellen nach Schiedsrichter-Keywords
-            tables = soup.find_all('table')
-            for table in tables:
-                rows = table.find_all('tr')
-                for row in rows:
-                    cells = row.find_all(['td', 'th'])
-                    for i, cell in enumerate(cells):
-                        cell_text = cell.get_text(strip=True).lower()
-                        if any(keyword in cell_text for keyword in ['schiedsrichter', 'referee', 'ref', 'sr']):
-                            for j in range(i + 1, len(cells)):
-                                ref_name = cells[j].get_text(strip=True)
-                                if (ref_name and len(ref_name) > 2 and not ref_name.isdigit() and
-                                    ',' in ref_name and  # Schiedsrichter haben meist Format "Nachname, Vorname"
-                                    not any(word in ref_name.lower() for word in [
-                                        'essen', 'oberhausen', 'vs', 'mehr', 'spiel', 'solingen', 
-                                        'wuppertal', 'bochum', 'duisburg', 'rheinhausen', 'kevelaer',
-                                        'tpsk', 'sgw', 'sv', 'asc', 'wsg', 'blau-weiß'
-                                    ])):
-                                    all_ref_names.append(ref_name)
-            
-            # Entferne Duplikate
-            unique_refs = list(dict.fromkeys(all_ref_names))
-            
-            if unique_refs:
-                referee_info['referee1'] = unique_refs[0] if len(unique_refs) > 0 else ''
-                referee_info['referee2'] = unique_refs[1] if len(unique_refs) > 1 else ''
-                return referee_info
-            
-            return None
-            
-        except Exception as e:
-            return None
-    
-    def save_termine(self, termine: List[Dict]) -> Dict:
-        """Speichert Termine in der Datenbank"""
-        conn = sqlite3.connect(self.db_path)
+
+    def _fetch_all_game_details(self, termine: List[Dict]) -> Dict:
+        """Holt alle benötigten Spieldetails dedupliziert und parallel"""
+        pending = list({(t['game_id'], t.get('competition', 'cup'))
+                        for t in termine
+                        if t.get('needs_detail_fetch', False) and t.get('game_id')})
+        if not pending:
+            return {}
+
+        # Lazy Import, siehe _scrape_competition
+        from concurrent.futures import ThreadPoolExecutor
+
+        # I/O-bound: Threads reichen, die Session nutzt Keep-Alive-Pooling
+        with ThreadPoolExecutor(max_workers=8) as executor:
+            results = executor.map(lambda key: self.fetch_game_details(*key), pending)
+            return dict(zip(pending, results))
+
+    def save_termine(self, termine: List[Dict], incremental: bool = False) -> Dict:
+        """Speichert Termine in der Datenbank
+
+        Mit incremental=True werden bereits final gespeicherte Spiele
+        (Vergangenheit + echtes Ergebnis in der DB) übersprungen: weder
+        Detail-Fetch noch Neuvergleich - abgeschlossene Spiele ändern
+        sich nicht mehr.
+        """
+        conn = self._get_conn()
         cursor = conn.cursor()
-        
+
         new_games = []
         updated_games = []
         unchanged_games = []
-        
-        for termin in termine:
-            # Replace "SG Wasserball Essen" with "SGW Essen" in team names before saving
-            home_clean = termin.get('home', '').replace("SG Wasserball Essen", "SGW Essen")
-            guest_clean = termin.get('guest', '').replace("SG Wasserball Essen", "SGW Essen")
-            
-            event_id = self.generate_event_id(home_clean, guest_clean, termin.get('competition', ''))
-            
-            # Hole detaillierte Informationen falls nötig
-            game_details = None
-            if termin.get('needs_detail_fetch', False) and termin.get('game_id'):
-                game_details = self.fetch_game_details(termin['game_id'], termin.get('competition', 'cup'))
-            
-            # Bestimme finale Werte für Location und Description
-            base_location = termin.get('location', '')
-            base_result = termin.get('result', '')
-            
-            # Kombiniere Location: Adresse + Google Maps Link
-            final_location = base_location
-            final_description = ""
-            
-            if game_details:
-                # Kombiniere Adresse und Maps Link für Location
-                location_parts = []
-                if game_details.get('location_address'):
-                    location_parts.append(game_details['location_address'])
-                elif base_location.strip():
-                    location_parts.append(base_location)
+        insert_rows = []
+        update_rows = []
+
+        # Event-IDs vorab berechnen und alle vorhandenen Zeilen mit einem
+        # einzigen SELECT laden statt einem Round-Trip pro Termin
+        event_ids = [
+            self.generate_event_id(
+                t.get('home', '').replace("SG Wasserball Essen", "SGW Essen"),
+                t.get('guest', '').replace("SG Wasserball Essen", "SGW Essen"),
+                t.get('competition', ''))
+            for t in termine
+        ]
+        # In Blöcken von 500 abfragen, um unter SQLites Parameter-Limit
+        # zu bleiben, falls der Batch einmal sehr groß wird
+        existing_map = {}
+        for i in range(0, len(event_ids), 500):
+            chunk = event_ids[i:i + 500]
+            placeholders = ','.join('?' * len(chunk))
+            cursor.execute(f'''
+                SELECT event_id, home, guest, date, time, location, description
+                FROM games WHERE event_id IN ({placeholders})
+            ''', chunk)
+            existing_map.update((row[0], row[1:]) for row in cursor.fetchall())
+
+        # Inkrementeller Modus: Spiele, die laut DB in der Vergangenheit
+        # liegen und ein echtes Ergebnis haben, als final markieren
+        skip_event_ids = set()
+        if incremental:
+            now_ts = datetime.now().strftime('%Y-%m-%dT%H:%M')
+            for event_id in event_ids:
+                existing = existing_map.get(event_id)
+                if not existing:
+                    continue
+                old_start = _format_start_ts(existing[2], existing[3])
+                old_result = _parse_description_fields(existing[5]).get('result', '')
+                if old_start and old_start < now_ts and old_result and old_result != '-':
+                    skip_event_ids.add(event_id)
+
+        # Detail-Seiten vorab holen (dedupliziert über alle Wettbewerbe,
+        # parallel); final gespeicherte Spiele werden nicht neu geholt
+        details_map = self._fetch_all_game_details(
+            [t for t, eid in zip(termine, event_ids) if eid not in skip_event_ids])
+
+        # Alle Schreibzugriffe in einer expliziten Transaktion buendeln:
+        # ein COMMIT (fsync) am Ende statt Commit-Kosten pro Statement
+        cursor.execute('BEGIN IMMEDIATE')
+        try:
+            for termin, event_id in zip(termine, event_ids):
+                # Replace "SG Wasserball Essen" with "SGW Essen" in team names before saving
+                home_clean = termin.get('home', '').replace("SG Wasserball Essen", "SGW Essen")
+                guest_clean = termin.get('guest', '').replace("SG Wasserball Essen", "SGW Essen")
+
+                # Final gespeichertes Spiel: Zeile bleibt unangetastet
+                if event_id in skip_event_ids:
+                    unchanged_games.append(f"{home_clean} vs {guest_clean}")
+                    continue
+
+                # Sortierbarer Zeitstempel für SQL-Filter (siehe init_database)
+                start_ts = _format_start_ts(termin.get('date', ''), termin.get('time', ''))
+
+                # Detaillierte Informationen aus dem vorab geholten Ergebnis
+                game_details = details_map.get(
+                    (termin.get('game_id'), termin.get('competition', 'cup')))
+            
+                # Bestimme finale Werte für Location und Description
+                base_location = termin.get('location', '')
+                base_result = termin.get('result', '')
+            
+                # Kombiniere Location: Adresse + Google Maps Link
+                final_location = base_location
+                final_description = ""
+            
+                if game_details:
+                    # Kombiniere Adresse und Maps Link für Location
+                    location_parts = []
+                    if game_details.get('location_address'):
+                        location_parts.append(game_details['location_address'])
+                    elif base_location.strip():
+                        location_parts.append(base_location)
                 
-                if game_details.get('location_maps_link'):
-                    location_parts.append(game_details['location_maps_link'])
+                    if game_details.get('location_maps_link'):
+                        location_parts.append(game_details['location_maps_link'])
                 
-                if location_parts:
-                    final_location = ' | '.join(location_parts)
+                    if location_parts:
+                        final_location = ' | '.join(location_parts)
                 
-                # Formatiere Description basierend auf Spielstatus
-                description_parts = []
+                    # Formatiere Description basierend auf Spielstatus
+                    description_parts = []
                 
-                # Ergebnis hinzufügen
-                if game_details.get('is_played') and game_details.get('detailed_result'):
-                    # Gespieltes Spiel: Ergebnis von Detail-Seite
-                    description_parts.append(f"Result: {game_details['detailed_result']}")
-                elif base_result.strip():
-                    # Fallback auf base result von Übersichtsseite
-                    description_parts.append(f"Result: {base_result}")
-                else:
-                    # Kein Ergebnis verfügbar
-                    description_parts.append("Result: -")
+                    # Ergebnis hinzufügen
+                    if game_details.get('is_played') and game_details.get('detailed_result'):
+                        # Gespieltes Spiel: Ergebnis von Detail-Seite
+                        description_parts.append(f"Result: {game_details['detailed_result']}")
+                    elif base_result.strip():
+                        # Fallback auf base result von Übersichtsseite
+                        description_parts.append(f"Result: {base_result}")
+                    else:
+                        # Kein Ergebnis verfügbar
+                        description_parts.append("Result: -")
                 
-                # Schiedsrichter hinzufügen
-                if game_details.get('referee1'):
-                    description_parts.append(f"Ref 1: {game_details['referee1']}")
-                if game_details.get('referee2'):
-                    description_parts.append(f"Ref 2: {game_details['referee2']}")
+                    # Schiedsrichter hinzufügen
+                    if game_details.get('referee1'):
+                        description_parts.append(f"Ref 1: {game_details['referee1']}")
+                    if game_details.get('referee2'):
+                        description_parts.append(f"Ref 2: {game_details['referee2']}")
                 
-                final_description = '\n'.join(description_parts)
-            else:
-                # Keine Details verfügbar, verwende base values
-                if base_result.strip():
-                    final_description = f"Result: {base_result}"
+                    final_description = '\n'.join(description_parts)
                 else:
-                    final_description = "Result: -"
-            
-            # Füge Competition-Information zur Description hinzu (falls noch nicht vorhanden)
-            competition_type = termin.get('competition', 'pokal')
-            
-            # Bestimme Competition-Prefix basierend auf dem tatsächlichen Wettbewerb
-            if competition_type == 'pokal':
-                comp_prefix = "[POKAL]"
-            elif competition_type == 'nrw_pokal':
-                comp_prefix = "[NRW POKAL]"
-            elif competition_type == 'verbandsliga':
-                comp_prefix = "[VERBANDSLIGA]"
-            elif competition_type == 'ruhrgebietsliga':
-                comp_prefix = "[RUHRGEBIETSLIGA]"
-            else:
-                comp_prefix = f"[{competition_type.upper()}]"
-            
-            # Prüfe ob Competition-Info bereits vorhanden ist
-            existing_prefixes = ["[LIGA]", "[POKAL]", "[NRW POKAL]", "[VERBANDSLIGA]", "[RUHRGEBIETSLIGA]"]
-            has_prefix = any(final_description.startswith(prefix) for prefix in existing_prefixes)
+                    # Keine Details verfügbar, verwende base values
+                    if base_result.strip():
+                        final_description = f"Result: {base_result}"
+                    else:
+                        final_description = "Result: -"
+            
+                # Füge Competition-Information zur Description hinzu (falls noch nicht vorhanden)
+                competition_type = termin.get('competition', 'pokal')
+            
+                # Bestimme Competition-Prefix basierend auf dem tatsächlichen Wettbewerb
+                if competition_type == 'pokal':
+                    comp_prefix = "[POKAL]"
+                elif competition_type == 'nrw_pokal':
+                    comp_prefix = "[NRW POKAL]"
+                elif competition_type == 'verbandsliga':
+                    comp_prefix = "[VERBANDSLIGA]"
+                elif competition_type == 'ruhrgebietsliga':
+                    comp_prefix = "[RUHRGEBIETSLIGA]"
+                else:
+                    comp_prefix = f"[{competition_type.upper()}]"
             
-            if not has_prefix:
-                final_description = f"{comp_prefix}\n{final_description}"
+                # Prüfe ob Competition-Info bereits vorhanden ist
+                has_prefix = final_description.startswith(_COMPETITION_PREFIXES)
             
-            # Prüfe ob Event bereits existiert
-            cursor.execute('SELECT home, guest, date, time, location, description FROM games WHERE event_id = ?', (event_id,))
-            existing = cursor.fetchone()
+                if not has_prefix:
+                    final_description = f"{comp_prefix}\n{final_description}"
             
-            if existing:
-                # Vergleiche Daten um zu prüfen ob sich etwas geändert hat
-                old_home, old_guest, old_date, old_time, old_location, old_description = existing
-                
-                # Prüfe ob sich irgendwelche Daten geändert haben
-                data_changed = (
-                    old_home != home_clean or
-                    old_guest != guest_clean or
-                    old_date != termin.get('date', '') or
-                    old_time != termin.get('time', '') or
-                    old_location != final_location or
-                    old_description != final_description
-                )
-                
-                if data_changed:
-                    # Sammle detaillierte Änderungen für die Ausgabe
-                    changes = []
+                # Prüfe ob Event bereits existiert (vorab gebatchter SELECT)
+                existing = existing_map.get(event_id)
+                new_row = (home_clean, guest_clean, termin.get('date', ''),
+                           termin.get('time', ''), final_location, final_description)
+
+                if existing:
+                    # Ein Tupel-Vergleich für den häufigen "nichts geändert"-
+                    # Fall; die Einzelfeld-Checks laufen nur noch bei Änderung
+                    old_home, old_guest, old_date, old_time, old_location, old_description = existing
+
+                    if existing != new_row:
+                        # Sammle detaillierte Änderungen für die Ausgabe
+                        changes = []
                     
-                    # Check team name changes (rare but possible)
-                    if old_home != home_clean:
-                        changes.append(f"home team: {old_home} -> {home_clean}")
-                    if old_guest != guest_clean:
-                        changes.append(f"guest team: {old_guest} -> {guest_clean}")
+                        # Check team name changes (rare but possible)
+                        if old_home != home_clean:
+                            changes.append(f"home team: {old_home} -> {home_clean}")
+                        if old_guest != guest_clean:
+                            changes.append(f"guest team: {old_guest} -> {guest_clean}")
                     
-                    # Check date and time changes
-                    if old_date != termin.get('date', ''):
-                        old_d = old_date if old_date else '(empty)'
-                        new_d = termin.get('date', '') if termin.get('date', '') else '(empty)'
-                        changes.append(f"date: {old_d} -> {new_d}")
-                    if old_time != termin.get('time', ''):
-                        old_t = old_time if old_time else '(empty)'
-                        new_t = termin.get('time', '') if termin.get('time', '') else '(empty)'
-                        changes.append(f"time: {old_t} -> {new_t}")
+                        # Check date and time changes
+                        if old_date != termin.get('date', ''):
+                            old_d = old_date if old_date else '(empty)'
+                            new_d = termin.get('date', '') if termin.get('date', '') else '(empty)'
+                            changes.append(f"date: {old_d} -> {new_d}")
+                        if old_time != termin.get('time', ''):
+                            old_t = old_time if old_time else '(empty)'
+                            new_t = termin.get('time', '') if termin.get('time', '') else '(empty)'
+                            changes.append(f"time: {old_t} -> {new_t}")
                     
-                    # Check location changes
-                    if old_location != final_location:
-                        # Show location change with details
-                        old_loc = old_location.split('|')[0].strip() if old_location else '(empty)'
-                        new_loc = final_location.split('|')[0].strip() if final_location else '(empty)'
-                        if old_loc != new_loc:
-                            changes.append(f"location: {old_loc} -> {new_loc}")
-                        elif '|' in old_location and '|' in final_location:
-                            # Location address same, but maps link might differ
-                            changes.append("location: maps link updated")
-                        else:
-                            changes.append("location: additional data added")
-                    if old_description != final_description:
-                        # Parse both descriptions to compare individual fields
-                        def parse_description(desc):
-                            fields = {}
-                            if desc:
-                                for line in desc.split('\n'):
-                                    if line.startswith('Result:'):
-                                        fields['result'] = line.replace('Result:', '').strip()
-                                    elif line.startswith('Ref 1:'):
-                                        fields['ref1'] = line.replace('Ref 1:', '').strip()
-                                    elif line.startswith('Ref 2:'):
-                                        fields['ref2'] = line.replace('Ref 2:', '').strip()
-                            return fields
-                        
-                        old_fields = parse_description(old_description)
-                        new_fields = parse_description(final_description)
+                        # Check location changes
+                        if old_location != final_location:
+                            # Show location change with details
+                            old_loc = old_location.split('|')[0].strip() if old_location else '(empty)'
+                            new_loc = final_location.split('|')[0].strip() if final_location else '(empty)'
+                            if old_loc != new_loc:
+                                changes.append(f"location: {old_loc} -> {new_loc}")
+                            elif '|' in old_location and '|' in final_location:
+                                # Location address same, but maps link might differ
+                                changes.append("location: maps link updated")
+                            else:
+                                changes.append("location: additional data added")
+                        if old_description != final_description:
+                            # Parse both descriptions to compare individual fields
+                            old_fields = _parse_description_fields(old_description)
+                            new_fields = _parse_description_fields(final_description)
                         
-                        # Compare each field
-                        if old_fields.get('result', '') != new_fields.get('result', ''):
-                            old_res = old_fields.get('result', '-')
-                            new_res = new_fields.get('result', '-')
-                            changes.append(f"result: {old_res} -> {new_res}")
+                            # Compare each field
+                            if old_fields.get('result', '') != new_fields.get('result', ''):
+                                old_res = old_fields.get('result', '-')
+                                new_res = new_fields.get('result', '-')
+                                changes.append(f"result: {old_res} -> {new_res}")
                         
-                        if old_fields.get('ref1', '') != new_fields.get('ref1', ''):
-                            old_ref = old_fields.get('ref1', 'none')
-                            new_ref = new_fields.get('ref1', 'none')
-                            if old_ref == 'none' and new_ref != 'none':
-                                changes.append(f"referee 1 added: {new_ref}")
-                            elif old_ref != 'none' and new_ref == 'none':
-                                changes.append(f"referee 1 removed")
-                            else:
-                                changes.append(f"referee 1: {old_ref} -> {new_ref}")
+                            if old_fields.get('ref1', '') != new_fields.get('ref1', ''):
+                                old_ref = old_fields.get('ref1', 'none')
+                                new_ref = new_fields.get('ref1', 'none')
+                                if old_ref == 'none' and new_ref != 'none':
+                                    changes.append(f"referee 1 added: {new_ref}")
+                                elif old_ref != 'none' and new_ref == 'none':
+                                    changes.append(f"referee 1 removed")
+                                else:
+                                    changes.append(f"referee 1: {old_ref} -> {new_ref}")
                         
-                        if old_fields.get('ref2', '') != new_fields.get('ref2', ''):
-                            old_ref = old_fields.get('ref2', 'none')
-                            new_ref = new_fields.get('ref2', 'none')
-                            if old_ref == 'none' and new_ref != 'none':
-                                changes.append(f"referee 2 added: {new_ref}")
-                            elif old_ref != 'none' and new_ref == 'none':
-                                changes.append(f"referee 2 removed")
-                            else:
-                                changes.append(f"referee 2: {old_ref} -> {new_ref}")
+                            if old_fields.get('ref2', '') != new_fields.get('ref2', ''):
+                                old_ref = old_fields.get('ref2', 'none')
+                                new_ref = new_fields.get('ref2', 'none')
+                                if old_ref == 'none' and new_ref != 'none':
+                                    changes.append(f"referee 2 added: {new_ref}")
+                                elif old_ref != 'none' and new_ref == 'none':
+                                    changes.append(f"referee 2 removed")
+                                else:
+                                    changes.append(f"referee 2: {old_ref} -> {new_ref}")
                     
-                    # Fallback: If description changed but no specific changes detected, note it
-                    if not changes and old_description != final_description:
-                        changes.append("description updated (unknown field)")
+                        # Fallback: If description changed but no specific changes detected, note it
+                        if not changes and old_description != final_description:
+                            changes.append("description updated (unknown field)")
                     
-                    # Aktualisiere nur wenn sich tatsächlich etwas geändert hat
-                    cursor.execute('''
-                        UPDATE games 
-                        SET home = ?, guest = ?, date = ?, time = ?, location = ?, description = ?, 
-                            last_change = CURRENT_TIMESTAMP
-                        WHERE event_id = ?
-                    ''', (
+                        # Aktualisiere nur wenn sich tatsächlich etwas geändert hat
+                        # (gesammelt, geschrieben wird per executemany)
+                        update_rows.append((
+                            home_clean,
+                            guest_clean,
+                            termin.get('date', ''),
+                            termin.get('time', ''),
+                            final_location,
+                            final_description,
+                            start_ts,
+                            event_id
+                        ))
+
+                        updated_games.append({
+                            'match': f"{home_clean} vs {guest_clean}",
+                            'date': termin.get('date', ''),
+                            'changes': changes
+                        })
+                    else:
+                        # Keine Änderungen - überspringe UPDATE
+                        unchanged_games.append(f"{home_clean} vs {guest_clean}")
+                else:
+                    # Neuen Eintrag sammeln, eingefügt wird gesammelt per executemany
+                    insert_rows.append((
+                        event_id,
                         home_clean,
                         guest_clean,
                         termin.get('date', ''),
                         termin.get('time', ''),
                         final_location,
                         final_description,
-                        event_id
+                        start_ts
                     ))
-                    
-                    updated_games.append({
+                    new_games.append({
                         'match': f"{home_clean} vs {guest_clean}",
                         'date': termin.get('date', ''),
-                        'changes': changes
+                        'time': termin.get('time', ''),
+                        'competition': comp_prefix
                     })
-                else:
-                    # Keine Änderungen - überspringe UPDATE
-                    unchanged_games.append(f"{home_clean} vs {guest_clean}")
-            else:
-                # Füge neuen Eintrag hinzu
-                cursor.execute('''
-                    INSERT INTO games 
-                    (event_id, home, guest, date, time, location, description)
-                    VALUES (?, ?, ?, ?, ?, ?, ?)
-                ''', (
-                    event_id,
-                    home_clean,
-                    guest_clean,
-                    termin.get('date', ''),
-                    termin.get('time', ''),
-                    final_location,
-                    final_description
-                ))
-                new_games.append({
-                    'match': f"{home_clean} vs {guest_clean}",
-                    'date': termin.get('date', ''),
-                    'time': termin.get('time', ''),
-                    'competition': comp_prefix
-                })
-        
-        conn.commit()
-        conn.close()
-        
+
+                # Map aktuell halten, falls dieselbe Event-ID im Batch doppelt vorkommt
+                existing_map[event_id] = new_row
+
+            # Erst alle neuen Zeilen einfügen, dann die Updates schreiben:
+            # taucht dieselbe Event-ID im Batch zweimal auf (einmal neu,
+            # einmal geändert), muss die Zeile existieren, bevor das UPDATE
+            # der zweiten Fassung sie treffen kann
+            if insert_rows:
+                cursor.executemany(_INSERT_GAME_SQL, insert_rows)
+
+            if update_rows:
+                cursor.executemany(_UPDATE_GAME_SQL, update_rows)
+
+            conn.commit()
+        except Exception:
+            conn.rollback()
+            raise
+
         return {
             'new': new_games,
             'updated': updated_games,
@@ -879,49 +1158,48 @@ class SGWTermineScraper:
     
     def delete_games_and_recalculate_ids(self, ids_to_delete: List[int]) -> int:
         """Löscht Spiele mit den angegebenen IDs und berechnet IDs neu"""
-        conn = sqlite3.connect(self.db_path)
+        conn = self._get_conn()
         cursor = conn.cursor()
-        
+
         # Prüfe welche IDs existieren
         placeholders = ','.join(['?' for _ in ids_to_delete])
         cursor.execute(f'SELECT id FROM games WHERE id IN ({placeholders})', ids_to_delete)
         existing_ids = [row[0] for row in cursor.fetchall()]
-        
+
         if not existing_ids:
             print("No games found with specified IDs")
-            conn.close()
             return 0
         
         print(f"Deleting {len(existing_ids)} games with IDs: {existing_ids}")
-        
+
+        # Löschen und Neunummerieren atomar in einer Transaktion
+        cursor.execute('BEGIN IMMEDIATE')
+
         # Lösche die Spiele
         cursor.execute(f'DELETE FROM games WHERE id IN ({placeholders})', ids_to_delete)
         deleted_count = cursor.rowcount
         
-        # Hole alle verbleibenden Spiele und sortiere sie nach ID
-        cursor.execute('SELECT * FROM games ORDER BY id')
-        remaining_games = cursor.fetchall()
-        
-        # Lösche alle Spiele und füge sie mit neuen IDs ein
-        cursor.execute('DELETE FROM games')
-        
-        for i, game in enumerate(remaining_games, 1):
-            # Neue ID ist i, restliche Daten bleiben gleich
-            (old_id, event_id, home, guest, date, time, location, description, last_change) = game
-            cursor.execute('''
-                INSERT INTO games 
-                (id, event_id, home, guest, date, time, location, description, last_change)
-                VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?)
-            ''', (i, event_id, home, guest, date, time, location, description, last_change))
-        
+        # Neunummerieren komplett in SQL statt alle Zeilen zu löschen und per
+        # Python neu einzufügen. Zwei Schritte über negative IDs, damit es
+        # keine transienten Primärschlüssel-Kollisionen gibt.
+        cursor.execute('''
+            UPDATE games SET id = -(
+                SELECT new_id FROM (
+                    SELECT id AS old_id, ROW_NUMBER() OVER (ORDER BY id) AS new_id
+                    FROM games
+                ) WHERE old_id = games.id
+            )
+        ''')
+        cursor.execute('UPDATE games SET id = -id')
+
         # Setze den Auto-Increment Counter
-        max_id = len(remaining_games)
+        cursor.execute('SELECT COUNT(*) FROM games')
+        max_id = cursor.fetchone()[0]
         cursor.execute('DELETE FROM sqlite_sequence WHERE name="games"')
         cursor.execute('INSERT INTO sqlite_sequence (name, seq) VALUES ("games", ?)', (max_id,))
         
         conn.commit()
-        conn.close()
-        
+
         print(f"{deleted_count} games deleted")
         print(f"IDs recalculated, next ID: {max_id + 1}")
         
@@ -929,30 +1207,64 @@ class SGWTermineScraper:
     
     def generate_ics(self, output_file: str = "sgw_termine.ics") -> str:
         """Generiert ICS-Kalenderdatei"""
-        conn = sqlite3.connect(self.db_path)
+        conn = self._get_conn()
         cursor = conn.cursor()
         
+        # Chronologisch über den ISO-Zeitstempel sortieren: start_ts sortiert
+        # lexikographisch korrekt und idx_start_ts liefert die Reihenfolge
+        # ohne Sortierschritt; "DD.MM.YYYY"-Strings würden falsch sortieren.
+        # NULL-start_ts-Zeilen kommen zuerst und werden beim Parsen ohnehin
+        # übersprungen.
         cursor.execute('''
-            SELECT id, event_id, home, guest, date, time, location, description
-            FROM games 
-            ORDER BY date, time
+            SELECT id, event_id, home, guest, date, time, location, description,
+                   sequence, last_change
+            FROM games
+            ORDER BY start_ts
         ''')
         
-        termine = cursor.fetchall()
-        conn.close()
-        
-        ics_content = self._create_ics_content(termine)
-        
-        with open(output_file, 'w', encoding='utf-8') as f:
-            f.write(ics_content)
-        
+        # Zeilen direkt aus dem Cursor in eine Temp-Datei streamen - weder die
+        # Ergebniszeilen noch der ICS-Inhalt werden komplett materialisiert.
+        # Nebenbei einen Content-Hash (ohne die volatilen DTSTAMP-Zeilen)
+        # mitrechnen, um unveränderte Kalender gar nicht erst zu ersetzen.
+        tmp_file = output_file + '.tmp'
+        content_hash = hashlib.blake2b(digest_size=16)
+        with open(tmp_file, 'w', encoding='utf-8', buffering=65536) as f:
+            for line in self._iter_ics_lines(cursor):
+                if not line.startswith('DTSTAMP:'):
+                    content_hash.update(line.encode('utf-8'))
+                f.write(f"{line}\n")
+            # Daten vor dem Rename auf die Platte zwingen - sonst kann nach
+            # einem Crash ein leeres, aber fertig umbenanntes File übrig bleiben
+            f.flush()
+            os.fsync(f.fileno())
+
+        digest = content_hash.hexdigest()
+        sidecar = output_file + '.sha'
+        try:
+            with open(sidecar, 'r', encoding='ascii') as f:
+                previous_digest = f.read().strip()
+        except OSError:
+            previous_digest = None
+
+        if digest == previous_digest and os.path.exists(output_file):
+            # Inhalt identisch: bestehende Datei (und ihren mtime) behalten
+            os.remove(tmp_file)
+            return output_file
+
+        # Atomarer Tausch - Leser sehen nie eine halb geschriebene Datei
+        os.replace(tmp_file, output_file)
+        with open(sidecar, 'w', encoding='ascii') as f:
+            f.write(digest)
+
         return output_file
-    
-    def _create_ics_content(self, termine: List) -> str:
-        """Erstellt ICS-Inhalt"""
-        now = datetime.now()
-        
-        ics_lines = [
+
+    def _iter_ics_lines(self, termine):
+        """Generiert ICS-Inhalt zeilenweise aus iterierbaren Terminen"""
+        # Schleifeninvarianten einmal berechnen statt pro Event
+        dtstamp = _ics_ts(datetime.now()) + 'Z'
+        game_duration = timedelta(hours=2)
+
+        yield from (
             "BEGIN:VCALENDAR",
             "VERSION:2.0",
             "PRODID:-//SGW Essen//Termine Scraper//DE",
@@ -960,69 +1272,63 @@ class SGWTermineScraper:
             "METHOD:PUBLISH",
             "X-WR-CALNAME:SGW Essen Wasserball Termine",
             "X-WR-CALDESC:Automatisch generierte Termine für SGW Essen",
-            "X-WR-TIMEZONE:Europe/Berlin"
-        ]
-        
+            "X-WR-TIMEZONE:Europe/Berlin",
+        )
+
         for termin in termine:
-            (id, event_id, home, guest, date, time, location, description) = termin
+            (id, event_id, home, guest, date, time,
+             location, description, sequence, last_change) = termin
             
             uid = f"sgw-{event_id}@essen.de"
             # Extrahiere Competition-Info aus Description für Titel
             # Kalender-Titel ohne Competition-Tags
             title = f"{home} vs {guest}"
             
-            # Parse Datum
-            try:
-                if '.' in date:
-                    dt = datetime.strptime(date, '%d.%m.%Y')
-                else:
-                    dt = datetime.strptime(date, '%Y-%m-%d')
-            except:
+            # Parse Datum und Zeit über den memoisierten Parser
+            start_time = _parse_game_datetime(date, time)
+            if start_time is None:
                 continue
-            
-            # Parse Zeit
-            start_time = dt
-            if time and ':' in time:
-                try:
-                    time_parts = time.split(':')
-                    start_time = dt.replace(
-                        hour=int(time_parts[0]),
-                        minute=int(time_parts[1])
-                    )
-                except:
-                    pass
-            
-            end_time = start_time + timedelta(hours=2)
-            
+
+            end_time = start_time + game_duration
+
             # ICS Format
-            dtstart = start_time.strftime('%Y%m%dT%H%M%S')
-            dtend = end_time.strftime('%Y%m%dT%H%M%S')
-            dtstamp = now.strftime('%Y%m%dT%H%M%SZ')
-            
-            # Verwende Description direkt (bereits formatiert mit Result/Refs)
-            # Ersetze \n durch \\n für korrekte ICS-Formatierung
-            ics_description = description.replace('\n', '\\n') if description else ""
+            dtstart = _ics_ts(start_time)
+            dtend = _ics_ts(end_time)
             
+            # Verwende Description direkt (bereits formatiert mit Result/Refs);
+            # RFC-5545-Escaping über die vorbereitete translate-Tabelle
+            ics_description = description.translate(_ICS_ESCAPE) if description else ""
+
             # Location: Kombiniere Adresse und Google Maps Link für bessere Kalender-Integration
-            if location and '|' in location:
-                parts = location.split('|', 1)
-                address = parts[0].strip()
-                maps_link = parts[1].strip()
+            # (partition: ein Scan liefert Adresse und Maps-Teil zugleich)
+            address, sep, maps_link = location.partition('|') if location else ("", "", "")
+            if sep:
+                address = address.strip()
+                maps_link = maps_link.strip()
                 if address and maps_link:
                     # Format: "Address\nGoogle Maps: Link" für bessere Darstellung in Kalendern
-                    location_text = f"{address}\\nGoogle Maps: {maps_link}"
+                    location_text = f"{address}\nGoogle Maps: {maps_link}"
                 else:
                     location_text = address if address else maps_link
             else:
                 location_text = location.strip() if location else "TBA"
-            
-            location_text = location_text if location_text else "TBA"
-            
+
+            location_text = location_text.translate(_ICS_ESCAPE) if location_text else "TBA"
+            
+            # SEQUENCE/LAST-MODIFIED: Clients erkennen daran geänderte Events,
+            # ohne den restlichen Kalender neu verarbeiten zu müssen.
+            # last_change kommt als "YYYY-MM-DD HH:MM:SS" (UTC) aus SQLite.
+            last_modified = (
+                last_change.replace('-', '').replace(':', '').replace(' ', 'T') + 'Z'
+                if last_change else dtstamp)
+
             # Event
-            ics_lines.extend([
+            yield from (
                 "BEGIN:VEVENT",
                 f"UID:{uid}",
                 f"DTSTAMP:{dtstamp}",
+                f"SEQUENCE:{sequence}",
+                f"LAST-MODIFIED:{last_modified}",
                 f"DTSTART:{dtstart}",
                 f"DTEND:{dtend}",
                 f"SUMMARY:{title}",
@@ -1030,181 +1336,127 @@ class SGWTermineScraper:
                 f"LOCATION:{location_text}",
                 "STATUS:CONFIRMED",
                 "TRANSP:OPAQUE",
-                "END:VEVENT"
-            ])
-        
-        ics_lines.append("END:VCALENDAR")
-        return "\n".join(ics_lines)
+                "END:VEVENT",
+            )
+
+        yield "END:VCALENDAR"
     
     def list_next_termine(self, limit: int = 10):
         """Zeigt die nächsten anstehenden Termine (ab heute)"""
-        conn = sqlite3.connect(self.db_path)
+        conn = self._get_conn()
         cursor = conn.cursor()
         
         # Get current date
         today_dt = datetime.now().replace(hour=0, minute=0, second=0, microsecond=0)
-        
+
+        # Filterung und Sortierung über den start_ts-Index in SQL statt
+        # alle Zeilen zu laden und jedes Datum in Python zu parsen;
+        # nur die tatsächlich angezeigten Spalten abholen
         cursor.execute('''
-            SELECT id, date, time, home, guest, location, description, last_change
+            SELECT date, time, home, guest, location, description
             FROM games
-        ''')
-        
-        all_termine = cursor.fetchall()
-        conn.close()
-        
-        # Filter for future games and parse dates
-        future_termine_with_dt = []
-        
-        for termin in all_termine:
-            (id, date, time, home, guest, location, description, last_change) = termin
-            try:
-                if '.' in date:
-                    game_dt = datetime.strptime(date, '%d.%m.%Y')
-                else:
-                    game_dt = datetime.strptime(date, '%Y-%m-%d')
-                
-                # Add time if available for better sorting
-                if time:
-                    time_parts = time.split(':')
-                    game_dt = game_dt.replace(hour=int(time_parts[0]), minute=int(time_parts[1]))
-                
-                # Include games from today onwards
-                if game_dt >= today_dt:
-                    future_termine_with_dt.append((game_dt, termin))
-            except:
-                continue
-        
-        # Sort by datetime and take first N
-        future_termine_with_dt.sort(key=lambda x: x[0])
-        future_termine = [termin for dt, termin in future_termine_with_dt[:limit]]
+            WHERE start_ts >= ?
+            ORDER BY start_ts
+            LIMIT ?
+        ''', (today_dt.strftime('%Y-%m-%dT%H:%M'), limit))
+
+        future_termine = cursor.fetchall()
         
         if not future_termine:
             print("No upcoming games found.")
             return
         
-        print(f"\n=== Next {len(future_termine)} Upcoming Games ===")
-        print("-" * 69)
-        
+        # Ausgabe sammeln und einmal schreiben statt print() pro Zeile
+        out = [f"\n=== Next {len(future_termine)} Upcoming Games ===", "-" * 69]
+
         for termin in future_termine:
-            (id, date, time, home, guest, location, description, last_change) = termin
+            (date, time, home, guest, location, description) = termin
             time_str = f" {time}" if time else ""
             
-            # Competition indicator aus Description extrahieren
+            # Description einmal zerlegen: Competition-Tag aus der ersten
+            # Zeile, Detail-Zeilen (Result/Refs) für die Anzeige darunter
             comp_str = ""
-            if description:
-                if description.startswith("[VERBANDSLIGA]"):
-                    comp_str = "[VERBANDSLIGA] "
-                elif description.startswith("[RUHRGEBIETSLIGA]"):
-                    comp_str = "[RUHRGEBIETSLIGA] "
-                elif description.startswith("[NRW POKAL]"):
-                    comp_str = "[NRW POKAL] "
-                elif description.startswith("[POKAL]"):
-                    comp_str = "[POKAL] "
-                elif description.startswith("[LIGA]"):
-                    comp_str = "[LIGA] "
-            
-            # Location: Zeige nur Adress-Teil
-            display_location = location.split('|')[0].strip() if location else ""
-            location_str = f" @ {display_location}" if display_location else ""
-            
-            print(f"{comp_str}{date}{time_str}{location_str}")
-            print(f"      | {home} vs {guest}")
-            
-            # Zeige Description (Result/Refs) wenn vorhanden
+            detail_lines = []
             if description and description.strip():
                 desc_lines = description.split('\n')
-                for desc_line in desc_lines:
-                    if not desc_line.startswith('['):  # Skip competition tag
-                        print(f"      | {desc_line}")
-            
-            print("-" * 69)
+                comp_match = _RE_COMP_TAG.match(desc_lines[0])
+                if comp_match:
+                    comp_str = comp_match.group(1) + " "
+                detail_lines = [line for line in desc_lines
+                                if not line.startswith('[')]  # Skip competition tag
+
+            # Location: Zeige nur Adress-Teil (ein Scan via partition)
+            display_location = location.partition('|')[0].strip() if location else ""
+            location_str = f" @ {display_location}" if display_location else ""
+
+            out.append(f"{comp_str}{date}{time_str}{location_str}")
+            out.append(f"      | {home} vs {guest}")
+            out.extend(f"      | {desc_line}" for desc_line in detail_lines)
+            out.append("-" * 69)
+
+        sys.stdout.write('\n'.join(out) + '\n')
     
     def list_termine(self, limit: int = 10):
         """Zeigt Termine aus der Datenbank"""
-        conn = sqlite3.connect(self.db_path)
+        conn = self._get_conn()
         cursor = conn.cursor()
         
+        # Chronologisch über start_ts sortieren (nutzt idx_start_ts);
+        # Einträge ohne parsebares Datum (start_ts NULL) ans Ende;
+        # nur die tatsächlich angezeigten Spalten abholen
         cursor.execute('''
-            SELECT id, date, time, home, guest, location, description, last_change
+            SELECT date, time, home, guest, location, description, last_change
             FROM games
-        ''')
-        
-        all_termine = cursor.fetchall()
-        conn.close()
-        
-        if not all_termine:
-            print("No games found in database.")
-            print("Use --add to add games")
-            return
-        
-        # Sort by actual date in Python (not as string)
-        def get_sort_key(termin):
-            (id, date, time, home, guest, location, description, last_change) = termin
-            try:
-                if '.' in date:
-                    dt = datetime.strptime(date, '%d.%m.%Y')
-                else:
-                    dt = datetime.strptime(date, '%Y-%m-%d')
-                
-                # Add time if available
-                if time:
-                    time_parts = time.split(':')
-                    dt = dt.replace(hour=int(time_parts[0]), minute=int(time_parts[1]))
-                
-                return dt
-            except:
-                return datetime.max  # Put invalid dates at the end
-        
-        # Sort and limit
-        termine = sorted(all_termine, key=get_sort_key)[:limit]
-        
+            ORDER BY start_ts IS NULL, start_ts
+            LIMIT ?
+        ''', (limit,))
+
+        termine = cursor.fetchall()
+
         if not termine:
             print("No games found in database.")
             print("Use --add to add games")
             return
         
-        print(f"\n=== {len(termine)} Termine ===")
-        print("-" * 69)
+        # Ausgabe sammeln und einmal schreiben statt print() pro Zeile
+        out = [f"\n=== {len(termine)} Termine ===", "-" * 69]
         for termin in termine:
-            (id, date, time, home, guest, location, description, last_change) = termin
+            (date, time, home, guest, location, description, last_change) = termin
             time_str = f" {time}" if time else ""
             
             # Competition indicator aus Description extrahieren
             comp_str = ""
             if description:
-                if description.startswith("[VERBANDSLIGA]"):
-                    comp_str = "[VERBANDSLIGA] "
-                elif description.startswith("[RUHRGEBIETSLIGA]"):
-                    comp_str = "[RUHRGEBIETSLIGA] "
-                elif description.startswith("[NRW POKAL]"):
-                    comp_str = "[NRW POKAL] "
-                elif description.startswith("[POKAL]"):
-                    comp_str = "[POKAL] "
-                elif description.startswith("[LIGA]"):  # Fallback für alte Einträge
-                    comp_str = "[LIGA] "
-            
-            # Location: Zeige nur Adress-Teil (vor "|"), Maps-Link wird separat angezeigt
-            display_location = location.split('|')[0].strip() if location else ""
+                comp_match = _RE_COMP_TAG.match(description)
+                if comp_match:  # "[LIGA]" deckt als Fallback alte Einträge ab
+                    comp_str = comp_match.group(1) + " "
+            
+            # Location: Zeige nur Adress-Teil (vor "|"), Maps-Link wird separat
+            # angezeigt; partition liefert beide Teile mit einem Scan
+            address_part, maps_sep, maps_part = location.partition('|') if location else ("", "", "")
+            display_location = address_part.strip()
             location_str = f" @ {display_location}" if display_location else ""
-            maps_str = f" [Maps]" if '|' in location else ""
-            
-            print(f"{comp_str}{date}{time_str}{location_str}{maps_str}")
-            print(f"      | {home} vs {guest}")
+            maps_str = f" [Maps]" if maps_sep else ""
             
+            out.append(f"{comp_str}{date}{time_str}{location_str}{maps_str}")
+            out.append(f"      | {home} vs {guest}")
+
             # Zeige Description (Result/Refs) wenn vorhanden
             if description and description.strip():
-                desc_lines = description.split('\n')
-                for desc_line in desc_lines:
-                    print(f"      | {desc_line}")
-            
+                out.extend(f"      | {desc_line}"
+                           for desc_line in description.split('\n'))
+
             # Zeige Google Maps Link wenn vorhanden
-            if '|' in location:
-                maps_link = location.split('|', 1)[1].strip()
+            if maps_sep:
+                maps_link = maps_part.strip()
                 if maps_link.startswith('http'):
-                    print(f"      | Maps: {maps_link}")
-            
-            print(f"      | Updated: {last_change}")
-            print("-" * 69)    
+                    out.append(f"      | Maps: {maps_link}")
+
+            out.append(f"      | Updated: {last_change}")
+            out.append("-" * 69)
+
+        sys.stdout.write('\n'.join(out) + '\n')
+
     def add_manual_termine(self) -> List[Dict]:
         """Interaktive Eingabe neuer Termine"""
         print("\n=== Manuelle Termineingabe ===")
@@ -1247,9 +1499,9 @@ class SGWTermineScraper:
         
         return termine
     
-    def run(self, scrape=True, add_new=False, enable_scraping=False) -> int:
+    def run(self, scrape=True, add_new=False, enable_scraping=False, incremental=True) -> int:
         """Hauptausführung
-        
+
         Returns:
             0 - No changes detected
             1 - Changes detected (new or updated games)
@@ -1273,7 +1525,9 @@ class SGWTermineScraper:
         has_changes = False
         
         if alle_termine:
-            results = self.save_termine(alle_termine)
+            # Manuelle Eingaben nie inkrementell überspringen
+            results = self.save_termine(alle_termine,
+                                        incremental=incremental and not add_new)
             has_changes = bool(results['new'] or results['updated'])
             
             # Print summary
@@ -1318,6 +1572,79 @@ class SGWTermineScraper:
         # Return exit code based on changes
         return 1 if has_changes else 0
 
+def _save_and_report(scraper, termine, ics_path) -> int:
+    """Speichert Termine, meldet Änderungen und regeneriert den Kalender einmal"""
+    results = scraper.save_termine(termine)
+    for game in results['new']:
+        print(f"Added: {game['match']}")
+    for game in results['updated']:
+        print(f"Updated: {game['match']}")
+    # ICS genau einmal regenerieren, egal wie viele Zeilen sich geändert haben
+    if results['new'] or results['updated']:
+        ics_file = scraper.generate_ics(ics_path)
+        print(f"ICS calendar updated: {ics_file}")
+        return 1  # Changes made
+    return 0  # No changes
+
+def _cmd_delete(scraper, args) -> int:
+    """Spiele löschen"""
+    deleted_count = scraper.delete_games_and_recalculate_ids(args.delete)
+    if deleted_count > 0:
+        # Generiere ICS nach dem Löschen
+        ics_file = scraper.generate_ics(args.ics)
+        print(f"ICS calendar updated: {ics_file}")
+        return 1  # Changes made
+    return 0  # No changes
+
+def _cmd_list(scraper, args) -> int:
+    """Liste anzeigen"""
+    scraper.list_termine(limit=args.limit)
+    return 0
+
+def _cmd_list_next(scraper, args) -> int:
+    """Nächste Termine anzeigen"""
+    scraper.list_next_termine(limit=args.list_next)
+    return 0
+
+def _cmd_add_batch(scraper, args) -> int:
+    """Batch-Import: alle Termine in einem save_termine-Aufruf, ein ICS-Rebuild"""
+    try:
+        with open(args.add_batch, 'r', encoding='utf-8') as f:
+            batch_termine = json.load(f)
+    except OSError as e:
+        print(f"Error: cannot read batch file: {e}")
+        return 2
+    except json.JSONDecodeError as e:
+        print(f"Error: invalid JSON in batch file: {e}")
+        return 2
+    if not isinstance(batch_termine, list):
+        print("Error: JSON file must contain a list of termin objects")
+        return 2
+
+    return _save_and_report(scraper, batch_termine, args.ics)
+
+def _cmd_add(scraper, args) -> int:
+    """Direkter Termin"""
+    date, time, home, guest, location, result = args.add
+    termin = {
+        'date': date,
+        'time': time,
+        'home': home,
+        'guest': guest,
+        'location': location,
+        'result': result
+    }
+    return _save_and_report(scraper, [termin], args.ics)
+
+# Dispatch-Tabelle: args-Attribut -> Handler (Reihenfolge = alte if-Kaskade)
+_COMMANDS = (
+    ('delete', _cmd_delete),
+    ('list', _cmd_list),
+    ('list_next', _cmd_list_next),
+    ('add_batch', _cmd_add_batch),
+    ('add', _cmd_add),
+)
+
 def main():
     parser = argparse.ArgumentParser(
         description='SGW Essen Wasserball Kalender Generator',
@@ -1337,8 +1664,12 @@ Beispiele:
                        help='Interaktive Eingabe neuer Termine')
     parser.add_argument('--add', nargs=6, metavar=('DATE', 'TIME', 'HOME', 'GUEST', 'LOCATION', 'RESULT'),
                        help='Termin direkt hinzufügen')
+    parser.add_argument('--add-batch', metavar='FILE',
+                       help='Mehrere Termine aus einer JSON-Datei (Liste von Termin-Objekten) hinzufügen')
     parser.add_argument('--enable-scraping', action='store_true',
                        help='Aktiviert Web-Scraping (für Tests oder wenn neue Website online)')
+    parser.add_argument('--force-full', action='store_true',
+                       help='Auch final gespeicherte (vergangene) Spiele neu abgleichen')
     parser.add_argument('--db', default='sgw_termine.db',
                        help='Pfad zur SQLite-Datenbank')
     parser.add_argument('--ics', default='sgw_termine.ics',
@@ -1355,54 +1686,22 @@ Beispiele:
     args = parser.parse_args()
     
     scraper = SGWTermineScraper(db_path=args.db)
-    
-    # Spiele löschen
-    if args.delete:
-        deleted_count = scraper.delete_games_and_recalculate_ids(args.delete)
-        if deleted_count > 0:
-            # Generiere ICS nach dem Löschen
-            ics_file = scraper.generate_ics(args.ics)
-            print(f"ICS calendar updated: {ics_file}")
-            sys.exit(1)  # Changes made
-        sys.exit(0)  # No changes
-    
-    # Liste anzeigen
-    if args.list:
-        scraper.list_termine(limit=args.limit)
-        sys.exit(0)
-    
-    # Nächste Termine anzeigen
-    if args.list_next:
-        scraper.list_next_termine(limit=args.list_next)
-        sys.exit(0)
-    
-    # Direkter Termin
-    if args.add:
-        date, time, home, guest, location, result = args.add
-        termin = {
-            'date': date,
-            'time': time,
-            'home': home,
-            'guest': guest,
-            'location': location,
-            'result': result
-        }
-        results = scraper.save_termine([termin])
-        if results['new']:
-            print(f"Added: {results['new'][0]['match']}")
-            ics_file = scraper.generate_ics(args.ics)
-            print(f"ICS calendar updated: {ics_file}")
-            sys.exit(1)  # Changes made
-        elif results['updated']:
-            print(f"Updated: {results['updated'][0]['match']}")
-            ics_file = scraper.generate_ics(args.ics)
-            print(f"ICS calendar updated: {ics_file}")
-            sys.exit(1)  # Changes made
-        sys.exit(0)  # No changes
-    
-    # Standard oder manuelle Eingabe
-    exit_code = scraper.run(scrape=args.enable_scraping, add_new=args.add_new, enable_scraping=args.enable_scraping)
-    sys.exit(exit_code)
+
+    # WAL sauber checkpointen, egal über welchen Zweig wir rausgehen
+    try:
+        # Erster gesetzter Subcommand gewinnt; ohne Subcommand läuft der
+        # Standard-/Scraping-Pfad
+        for name, handler in _COMMANDS:
+            if getattr(args, name):
+                sys.exit(handler(scraper, args))
+
+        # Standard oder manuelle Eingabe
+        exit_code = scraper.run(scrape=args.enable_scraping, add_new=args.add_new,
+                                enable_scraping=args.enable_scraping,
+                                incremental=not args.force_full)
+        sys.exit(exit_code)
+    finally:
+        scraper.close()
 
 if __name__ == "__main__":
     main()
\ No newline at end of file